@@ -1,15 +1,38 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from flask import Flask, request, jsonify, render_template
+import os
+
+# gevent 需在其他模块导入前打补丁，使 subprocess / socket / threading 变为协作式；
+# 用 gunicorn -k gevent 启动时由 worker 自动打补丁，其余场景可设置 CM_GEVENT=1
+if os.getenv("CM_GEVENT") == "1":
+    from gevent import monkey
+    monkey.patch_all()
+
+from flask import Flask, Response, request, render_template
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import subprocess
+import atexit
 import json
-import os
+import queue
+import selectors
+import threading
 import base64
 import logging
+import functools
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import MISSING, dataclass, field, fields
+from typing import ClassVar
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
 # =========================
 # 基本配置（按需修改）
 # =========================
@@ -17,75 +40,593 @@ CONTRACT_NAME = os.getenv("CM_CONTRACT", "CMNFA")
 SDK_CONF_PATH = os.getenv("CM_SDK", "./testdata/sdk_config.yml")
 CMC_BIN = os.getenv("CM_CMC_BIN", "./cmc")  # 相对工作目录
 WORK_DIR = os.getenv("CM_WORKDIR", "/home/young3/chainmaker-go/tools/cmc")
+# 调用方式：cli = 每次调用 cmc 命令行；sdk = 进程内 ChainMaker SDK 客户端（复用连接）；
+#         worker = 常驻 cmc-worker 子进程（见 cmc-worker/main.go）
+CM_MODE = os.getenv("CM_MODE", "cli").lower()
+CM_WORKER_BIN = os.getenv("CM_WORKER_BIN", "./cmc-worker")  # 相对工作目录
+CM_WORKERS = int(os.getenv("CM_WORKERS", "4"))
+# 只读查询缓存有效期（秒），0 表示不缓存
+CM_QUERY_TTL = float(os.getenv("CM_QUERY_TTL", "3"))
+CM_QUERY_CACHE_SIZE = int(os.getenv("CM_QUERY_CACHE_SIZE", "4096"))
+# 单进程内同时进行的链上调用上限（线程池大小）
+CM_MAX_INFLIGHT = int(os.getenv("CM_MAX_INFLIGHT", "32"))
+# /api/nfa/batch 单次最多调用数
+CM_BATCH_MAX = int(os.getenv("CM_BATCH_MAX", "100"))
+
+# 路径在进程内不变，启动时拼接并探测一次；缓存的结果为缺失时，下次调用会重新探测
+_CMC_FULL = os.path.join(WORK_DIR, os.path.basename(CMC_BIN))
+_SDK_FULL = os.path.join(WORK_DIR, SDK_CONF_PATH)
+_WORKER_FULL = os.path.join(WORK_DIR, os.path.basename(CM_WORKER_BIN))
+_CMC_OK = _SDK_OK = False
+
+def _probe_paths():
+    global _CMC_OK, _SDK_OK
+    _CMC_OK = os.path.exists(_CMC_FULL)
+    _SDK_OK = os.path.exists(_SDK_FULL)
+
+def _reprobe_missing():
+    # 缺失的文件可能稍后才部署：各进程在使用时自行重新探测，失败的 stat 代价低且少见
+    if not (_CMC_OK and _SDK_OK):
+        _probe_paths()
+
+_probe_paths()
 
 # Flask
 app = Flask(__name__, template_folder="templates", static_folder="static")
 CORS(app)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify / request.get_json 改用 orjson 编解码。"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 log = logging.getLogger("cmnfa")
 
 # =========================
 # 工具函数
 # =========================
-def _is_base64(s: str) -> bool:
-    try:
-        # 粗略判断：长度与字符集
-        if not s or any(c not in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=\n\r" for c in s):
-            return False
-        base64.b64decode(s, validate=True)
-        return True
-    except Exception:
-        return False
+def _dumpb(obj) -> bytes:
+    """紧凑 JSON（UTF-8 字节），优先使用 orjson。"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+
+def _dumps(obj) -> str:
+    return _dumpb(obj).decode("utf-8")
+
+_loads = orjson.loads if orjson is not None else json.loads
 
 def _decode_result(maybe_b64: str) -> str:
-    if isinstance(maybe_b64, str) and _is_base64(maybe_b64):
-        try:
-            return base64.b64decode(maybe_b64).decode("utf-8")
-        except Exception:
-            return maybe_b64
-    return maybe_b64
+    """结果若是合法 base64 且能按 UTF-8 解码则返回解码后的文本，否则原样返回。"""
+    if not isinstance(maybe_b64, str) or not maybe_b64:
+        return maybe_b64
+    try:
+        # validate=True 会在 C 中校验字符集
+        return base64.b64decode(maybe_b64, validate=True).decode("utf-8")
+    except ValueError:  # binascii.Error / UnicodeDecodeError / 非 ASCII 输入
+        return maybe_b64
+
+# cmc 命令的固定部分，启动时按是否同步等待结果预先拼好并编码为字节，
+# 省去 subprocess 每次对参数做 fsencode
+_CMD_BASE = tuple(os.fsencode(a) for a in (
+    CMC_BIN, "client", "contract", "user", "invoke",
+    f"--contract-name={CONTRACT_NAME}",
+    f"--sdk-conf-path={SDK_CONF_PATH}",
+))
+_CMD_SYNC = _CMD_BASE + (b"--sync-result=true",)
+_CMD_ASYNC = _CMD_BASE + (b"--sync-result=false",)
 
 def exec_cmc(method: str, params: dict | None = None, sync: bool = True, timeout=60):
     """
     调用：cmc client contract user invoke
     说明：本机使用 sdk_config.yml 指定的默认用户签名发起交易/查询。
     """
-    cmd = [
-        CMC_BIN, "client", "contract", "user", "invoke",
-        f"--contract-name={CONTRACT_NAME}",
-        f"--method={method}",
-        f"--sdk-conf-path={SDK_CONF_PATH}",
-        f"--sync-result={'true' if sync else 'false'}",
-    ]
+    cmd = [*(_CMD_SYNC if sync else _CMD_ASYNC), b"--method=" + method.encode("utf-8")]
     if params:
         # 用紧凑 JSON，避免 shell 解析问题
-        cmd.append("--params=" + json.dumps(params, separators=(',', ':')))
+        cmd.append(b"--params=" + _dumpb(params))
 
-    if not os.path.exists(os.path.join(WORK_DIR, os.path.basename(CMC_BIN))):
-        return False, f"找不到 CMC 可执行文件：{os.path.join(WORK_DIR, CMC_BIN)}"
-    if not os.path.exists(os.path.join(WORK_DIR, SDK_CONF_PATH)):
-        return False, f"找不到 SDK 配置：{os.path.join(WORK_DIR, SDK_CONF_PATH)}"
+    _reprobe_missing()
+    if not _CMC_OK:
+        return False, f"找不到 CMC 可执行文件：{_CMC_FULL}"
+    if not _SDK_OK:
+        return False, f"找不到 SDK 配置：{_SDK_FULL}"
 
-    log.info("Exec: %s", " ".join(cmd))
+    if log.isEnabledFor(logging.INFO):
+        log.info("Exec: %s", b" ".join(cmd).decode("utf-8", "replace"))
     try:
-        p = subprocess.run(cmd, cwd=WORK_DIR, capture_output=True, text=True, timeout=timeout)
-        stdout = (p.stdout or "").strip()
-        stderr = (p.stderr or "").strip()
+        # 以字节读取输出，直接交给 JSON 解析，避免整段输出先解码成 str 再复制一次
+        p = subprocess.run(cmd, cwd=WORK_DIR, capture_output=True, timeout=timeout)
+        stdout = p.stdout.strip()
         if p.returncode != 0:
-            return False, stderr or stdout or f"cmc 退出码 {p.returncode}"
+            msg = p.stderr.strip() or stdout
+            return False, msg.decode("utf-8", "replace") if msg else f"cmc 退出码 {p.returncode}"
         # stdout 一般就是 JSON
         try:
-            data = json.loads(stdout)
+            data = _loads(stdout)
         except Exception:
-            data = stdout
+            data = stdout.decode("utf-8", "replace")
         return True, data
     except subprocess.TimeoutExpired:
         return False, "执行超时"
     except Exception as e:
         return False, f"执行异常：{e}"
 
-def ok(data): return jsonify({"success": True, "data": data})
-def err(msg): return jsonify({"success": False, "error": msg})
+# =========================
+# 进程内 SDK 客户端（CM_MODE=sdk）
+# =========================
+# 模块在导入时加载（gunicorn --preload 下由 master 完成、各 worker 共享）；
+# 客户端本身持有 gRPC 连接，不能跨 fork 共享，由 _init_backends 在各进程内创建
+ChainClient = None
+_chain_client = None
+if CM_MODE == "sdk":
+    try:
+        from chainmaker.chain_client import ChainClient
+        from google.protobuf.json_format import MessageToDict
+    except ImportError as e:
+        log.warning("未安装 ChainMaker SDK，回退到 cmc 命令行：%s", e)
+
+def _gevent_patched() -> bool:
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched("socket")
+
+# grpcio 的阻塞调用不经过 gevent 的 socket，会卡住整个 worker 的 hub；
+# 需在创建任何 channel 之前切换到 gevent 兼容的轮询方式
+if ChainClient is not None and _gevent_patched():
+    import grpc.experimental.gevent as grpc_gevent
+    grpc_gevent.init_gevent()
+
+def _tx_response_to_dict(resp) -> dict:
+    """
+    将 TxResponse 转成与 cmc 输出一致的结构，
+    result 仍为 base64，接口层沿用 _decode_result 解码。
+    """
+    cr = resp.contract_result
+    return {
+        "code": resp.code,
+        "message": resp.message,
+        "contract_result": {
+            "code": cr.code,
+            "result": base64.b64encode(cr.result).decode("ascii"),
+            "message": cr.message,
+            "gas_used": cr.gas_used,
+            "contract_event": [MessageToDict(e, preserving_proto_field_name=True) for e in cr.contract_event],
+        },
+        "tx_id": resp.tx_id,
+        "tx_block_height": resp.tx_block_height,
+    }
+
+def _invoke_sdk(method: str, params: dict | None = None, sync: bool = True):
+    try:
+        resp = _chain_client.invoke_contract(CONTRACT_NAME, method, params or {}, with_sync_result=sync)
+    except Exception as e:
+        return False, f"执行异常：{e}"
+    if resp.code != 0:
+        return False, resp.message or f"交易失败，状态码 {resp.code}"
+    return True, _tx_response_to_dict(resp)
+
+# =========================
+# 常驻 cmc-worker 子进程池（CM_MODE=worker）
+# =========================
+class CmcWorker:
+    """
+    一个常驻的 cmc-worker 子进程，按行收发 JSON。
+    同一时刻只被一个线程使用（由 WorkerPool 保证）。
+    """
+
+    def __init__(self):
+        self._proc = None
+        self._sel = None
+        self._buf = b""
+        self._seq = 0
+
+    def _ensure(self):
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        cmd = [
+            CM_WORKER_BIN,
+            f"--contract-name={CONTRACT_NAME}",
+            f"--sdk-conf-path={SDK_CONF_PATH}",
+        ]
+        log.info("Start worker: %s", " ".join(cmd))
+        self._proc = subprocess.Popen(cmd, cwd=WORK_DIR, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._sel = selectors.DefaultSelector()
+        self._sel.register(self._proc.stdout, selectors.EVENT_READ)
+        self._buf = b""
+        return self._proc
+
+    def call(self, method: str, params: dict | None = None, sync: bool = True, timeout=60):
+        self._seq += 1
+        line = _dumpb({"id": self._seq, "method": method, "params": params or {}, "sync": sync})
+        try:
+            p = self._ensure()
+            p.stdin.write(line + b"\n")
+            p.stdin.flush()
+            return self._parse(self._readline(p, timeout), self._seq)
+        except TimeoutError:
+            # worker 卡住（如节点不可达），结束进程以释放池中的位置，下次调用重新拉起
+            self.close()
+            return False, "执行超时"
+        except (OSError, RuntimeError) as e:
+            # 进程异常或协议错位：丢弃该进程，下次调用重新拉起
+            self.close()
+            return False, f"执行异常：{e}" if isinstance(e, OSError) else str(e)
+
+    def _readline(self, p, timeout: float) -> bytes:
+        """读取一行响应，超过 timeout 秒未读完则抛 TimeoutError；进程退出时返回 b""。"""
+        deadline = time.monotonic() + timeout
+        while b"\n" not in self._buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._sel.select(remaining):
+                raise TimeoutError
+            # 直接读底层 fd：只取当前可读的数据，不经缓冲读取器（其 read(n) 会等满 n 字节）
+            try:
+                chunk = os.read(p.stdout.fileno(), 65536)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                return b""
+            self._buf += chunk
+        out, _, self._buf = self._buf.partition(b"\n")
+        return out
+
+    @staticmethod
+    def _parse(out: bytes, seq: int):
+        if not out:
+            raise RuntimeError("cmc-worker 已退出")
+        try:
+            resp = _loads(out)
+        except ValueError:
+            raise RuntimeError(f"cmc-worker 响应格式错误：{out[:200]!r}") from None
+        if resp.get("id") != seq:
+            raise RuntimeError("cmc-worker 响应序号不匹配")
+        if not resp.get("ok"):
+            return False, resp.get("error") or "执行失败"
+        return True, resp.get("data") or {}
+
+    def close(self):
+        p, self._proc = self._proc, None
+        if self._sel is not None:
+            self._sel.close()
+            self._sel = None
+        if p is not None:
+            if p.poll() is None:
+                p.kill()
+                p.wait()
+            for f in (p.stdin, p.stdout):
+                f.close()
+
+
+class WorkerPool:
+    """固定大小的 CmcWorker 池，空闲 worker 放在队列中按需取用。"""
+
+    def __init__(self, size: int):
+        self._idle = queue.Queue()
+        for _ in range(max(1, size)):
+            self._idle.put(CmcWorker())
+
+    def call(self, method: str, params: dict | None = None, sync: bool = True):
+        w = self._idle.get()
+        try:
+            return w.call(method, params, sync)
+        finally:
+            self._idle.put(w)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_worker_pool = None
+_backends_ready = False
+_backends_lock = threading.Lock()
+
+def _init_backends():
+    """
+    按进程创建 SDK 客户端 / worker 池，在首次调用时执行。
+    二者持有连接或子进程，不能在 gunicorn --preload 的 master 中创建后 fork 给 worker。
+    """
+    global _chain_client, _worker_pool, _backends_ready
+    with _backends_lock:
+        if _backends_ready:
+            return
+        if ChainClient is not None:
+            try:
+                _chain_client = ChainClient.from_conf(_SDK_FULL)
+                log.info("SDK client ready: %s", _SDK_FULL)
+            except Exception as e:
+                log.warning("SDK 客户端初始化失败，回退到 cmc 命令行：%s", e)
+        elif CM_MODE == "worker":
+            if os.path.exists(_WORKER_FULL):
+                _worker_pool = WorkerPool(CM_WORKERS)
+            else:
+                log.warning("找不到 cmc-worker：%s，回退到 cmc 命令行", _WORKER_FULL)
+        _backends_ready = True
+
+def _retry_backends():
+    """SDK / worker 此前初始化失败而回退到命令行时，下次调用重新尝试初始化。"""
+    global _backends_ready
+    with _backends_lock:
+        if CM_MODE != "cli" and _chain_client is None and _worker_pool is None:
+            _backends_ready = False
+
+def _reset_backends():
+    """fork 出的子进程丢弃继承来的客户端与 worker 池，首次调用时各自重新创建。"""
+    global _chain_client, _worker_pool, _backends_ready, _backends_lock
+    _chain_client = _worker_pool = None
+    _backends_ready = False
+    _backends_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_backends)
+
+def _shutdown():
+    """
+    进程退出时释放长连接：SDK 客户端与 cmc-worker 在整个进程生命周期内复用，
+    请求处理过程中不会关闭。
+    """
+    if _worker_pool is not None:
+        _worker_pool.close()
+    stop = getattr(_chain_client, "stop", None)
+    if stop is not None:
+        try:
+            stop()
+        except Exception as e:
+            log.warning("关闭 SDK 客户端失败：%s", e)
+
+atexit.register(_shutdown)
+
+# 进程内共享的阻塞调用线程池；信号量限制同时进行的链上调用数，突发请求排队而不是无限拉起子进程
+_EXEC = ThreadPoolExecutor(max_workers=CM_MAX_INFLIGHT, thread_name_prefix="cmc")
+_INFLIGHT = threading.BoundedSemaphore(CM_MAX_INFLIGHT)
+
+def invoke(method: str, params: dict | None = None, sync: bool = True):
+    """
+    统一调用入口：优先使用进程内 SDK 客户端或常驻 worker，都不可用时回退到 cmc 命令行。
+    返回 (ok, data)，data 结构与 cmc 输出 JSON 一致。
+    """
+    if not _backends_ready:
+        _init_backends()
+    with _INFLIGHT:
+        if _chain_client is not None:
+            return _invoke_sdk(method, params, sync)
+        if _worker_pool is not None:
+            return _worker_pool.call(method, params, sync)
+        return exec_cmc(method, params, sync)
+
+def invoke_many(calls):
+    """
+    批量调用，calls 为 (method, params, sync) 列表，结果与其顺序一致。
+    各调用在共享线程池中并发执行（worker 模式下分散到池中的多个 worker），总耗时约为最慢的一次而非累加。
+    gevent 打补丁后线程池中的线程即为协程，同样并发等待。
+    """
+    return list(_EXEC.map(lambda c: invoke(*c), calls))
+
+def _mode() -> str:
+    if not _backends_ready:
+        _init_backends()
+    if _chain_client is not None:
+        return "sdk"
+    if _worker_pool is not None:
+        return "worker"
+    return "cli"
+
+# =========================
+# 只读查询缓存
+# =========================
+_MISS = object()
+
+class QueryCache:
+    """
+    只读查询结果的 LRU + TTL 缓存，键为 (method, params)。
+    写操作完成后按方法/参数失效；失效时递增代数，避免并发中的旧结果被写回。
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._gen = 0
+
+    @staticmethod
+    def key(method: str, params: dict | None):
+        return method, frozenset((params or {}).items())
+
+    @property
+    def generation(self) -> int:
+        return self._gen
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISS
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return _MISS
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, gen: int):
+        if self._ttl <= 0:
+            return
+        with self._lock:
+            if gen != self._gen:
+                return
+            self._data[key] = (time.monotonic() + self._ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, *items):
+        """items 为 (method, params)；params 为 None 时失效该方法的全部缓存。"""
+        with self._lock:
+            self._gen += 1
+            for method, params in items:
+                if params is None:
+                    for k in [k for k in self._data if k[0] == method]:
+                        del self._data[k]
+                else:
+                    self._data.pop(self.key(method, params), None)
+
+_query_cache = QueryCache(CM_QUERY_CACHE_SIZE, CM_QUERY_TTL)
+
+def query(method: str, params: dict | None = None, default: str = ""):
+    """
+    只读查询：命中缓存直接返回，否则调用合约并缓存解码后的结果。
+    返回 (ok, result)，失败时 result 为错误信息。
+    """
+    key = QueryCache.key(method, params)
+    res = _query_cache.get(key)
+    if res is not _MISS:
+        return True, res
+    gen = _query_cache.generation
+    ok_, data = invoke(method, params)
+    if not ok_:
+        return False, data
+    # data -> {"contract_result":{"result": "MA==", "message":"Success",...}}
+    res = _decode_result(data.get("contract_result", {}).get("result", default))
+    _query_cache.set(key, res, gen)
+    return True, res
+
+def query_many(calls):
+    """
+    批量只读查询，calls 为 (method, params, default) 列表。
+    先查缓存，未命中的一次性交给 invoke_many；返回的 (ok, result) 与 calls 顺序一致。
+    """
+    results = [None] * len(calls)
+    misses = []
+    for i, (method, params, default) in enumerate(calls):
+        res = _query_cache.get(QueryCache.key(method, params))
+        if res is _MISS:
+            misses.append(i)
+        else:
+            results[i] = (True, res)
+    if not misses:
+        return results
+
+    gen = _query_cache.generation
+    outs = invoke_many([(calls[i][0], calls[i][1], True) for i in misses])
+    for i, (ok_, data) in zip(misses, outs):
+        method, params, default = calls[i]
+        if not ok_:
+            results[i] = (False, data)
+            continue
+        res = _decode_result(data.get("contract_result", {}).get("result", default))
+        _query_cache.set(QueryCache.key(method, params), res, gen)
+        results[i] = (True, res)
+    return results
+
+# 直接编码为字节构造响应，省去 jsonify 的参数处理与二次转换
+def ok(data): return Response(_dumpb({"success": True, "data": data}), mimetype="application/json")
+def err(msg): return Response(_dumpb({"success": False, "error": msg}), mimetype="application/json")
+
+# =========================
+# 请求体结构与校验
+# =========================
+# 字段均为字符串；metadata 可设 key（JSON 中的键名）与 strip（是否去除首尾空白，默认是）。
+# 无缺省值的字段为必填，任一为空时返回 empty_error。
+@dataclass(frozen=True, slots=True)
+class TokenReq:
+    tokenId: str
+    empty_error: ClassVar[str] = "tokenId 不能为空"
+
+@dataclass(frozen=True, slots=True)
+class AccountReq:
+    account: str
+    empty_error: ClassVar[str] = "account 不能为空"
+
+@dataclass(frozen=True, slots=True)
+class DashboardReq:
+    account: str = ""
+    tokenId: str = ""
+
+@dataclass(frozen=True, slots=True)
+class MintReq:
+    to: str
+    tokenId: str
+    categoryName: str
+    metadata_text: str = field(default="", metadata={"strip": False})
+    metadata_b64: str = field(default="", metadata={"strip": False})
+    empty_error: ClassVar[str] = "to / tokenId / categoryName 不能为空"
+
+@dataclass(frozen=True, slots=True)
+class TransferReq:
+    from_: str = field(metadata={"key": "from"})
+    to: str
+    tokenId: str
+    empty_error: ClassVar[str] = "from / to / tokenId 不能为空"
+
+@dataclass(frozen=True, slots=True)
+class CategoryReq:
+    categoryName: str
+    categoryURI: str
+    empty_error: ClassVar[str] = "categoryName / categoryURI 不能为空"
+
+def _compile_schema(cls) -> tuple:
+    """预先展开字段表：(属性名, JSON 键, 是否必填, 是否去空白, 缺省值)。"""
+    return tuple(
+        (f.name, f.metadata.get("key", f.name), f.default is MISSING,
+         f.metadata.get("strip", True), "" if f.default is MISSING else f.default)
+        for f in fields(cls)
+    )
+
+def _parse_body(cls, schema: tuple):
+    """读取一次原始请求体并按 schema 校验，返回 (请求对象, None) 或 (None, 错误响应)。GET 请求取查询参数。"""
+    if request.method == "GET":
+        req, msg = _check_fields(cls, schema, request.args.to_dict())
+        return (req, None) if req is not None else (None, err(msg))
+    try:
+        body = _loads(request.get_data() or b"{}")
+    except ValueError:
+        return None, err("请求体不是合法的 JSON")
+    if not isinstance(body, dict):
+        return None, err("请求体应为 JSON 对象")
+    req, msg = _check_fields(cls, schema, body)
+    return (req, None) if req is not None else (None, err(msg))
+
+def _check_fields(cls, schema: tuple, body: dict):
+    """按 schema 校验字典，返回 (请求对象, None) 或 (None, 错误信息)。"""
+    values = {}
+    for name, key, required, strip, default in schema:
+        v = body.get(key)
+        if v is None:
+            v = default
+        elif not isinstance(v, str):
+            return None, f"{key} 应为字符串"
+        elif strip:
+            v = v.strip()
+        if required and not v:
+            return None, cls.empty_error
+        values[name] = v
+    return cls(**values), None
+
+def validated(cls):
+    """视图装饰器：校验通过后把 cls 实例作为第一个参数传给视图，否则直接返回错误。"""
+    schema = _compile_schema(cls)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            req, resp = _parse_body(cls, schema)
+            return resp if req is None else view(req, *args, **kwargs)
+        return wrapper
+
+    return decorator
 
 # =========================
 # 页面
@@ -97,89 +638,165 @@ def home():
 # =========================
 # 系统与基础查询
 # =========================
-@app.get("/api/system/status")
-def system_status():
-    cmc_ok = os.path.exists(os.path.join(WORK_DIR, os.path.basename(CMC_BIN)))
-    cfg_ok = os.path.exists(os.path.join(WORK_DIR, SDK_CONF_PATH))
-    return ok({
-        "cmc": "OK" if cmc_ok else "MISSING",
-        "sdk_config": "OK" if cfg_ok else "MISSING",
+def _status() -> dict:
+    _reprobe_missing()
+    return {
+        "cmc": "OK" if _CMC_OK else "MISSING",
+        "sdk_config": "OK" if _SDK_OK else "MISSING",
+        "mode": _mode(),
         "contract": CONTRACT_NAME,
         "workdir": WORK_DIR,
         "time": datetime.now().isoformat()
-    })
+    }
+
+@app.get("/api/system/status")
+def system_status():
+    return ok(_status())
+
+@app.post("/api/system/recheck")
+def system_recheck():
+    """
+    重新探测 cmc / SDK 配置文件，并在此前回退到命令行时重试 SDK 客户端 / cmc-worker 初始化。
+    仅作用于处理本请求的进程；其余进程会在下次调用时自行重新探测缺失的文件。
+    """
+    _probe_paths()
+    _retry_backends()
+    return ok(_status())
 
 @app.get("/api/nfa/total-supply")
 def total_supply():
-    ok_, data = exec_cmc("TotalSupply", params=None, sync=True)
+    ok_, res = query("TotalSupply", default="MA==")
     if not ok_:
-        return err(data)
-    # data -> {"contract_result":{"result": "MA==", "message":"Success",...}}
-    res = data.get("contract_result", {}).get("result", "MA==")
-    return ok(_decode_result(res))
+        return err(res)
+    return ok(res)
 
 @app.post("/api/nfa/owner")
-def owner_of():
-    body = request.get_json(force=True)
-    token_id = body.get("tokenId", "").strip()
-    if not token_id:
-        return err("tokenId 不能为空")
-    ok_, data = exec_cmc("OwnerOf", {"tokenId": token_id})
+@validated(TokenReq)
+def owner_of(req: TokenReq):
+    ok_, res = query("OwnerOf", {"tokenId": req.tokenId})
     if not ok_:
-        return err(data)
-    res = data.get("contract_result", {}).get("result", "")
-    return ok(_decode_result(res))
+        return err(res)
+    return ok(res)
 
 @app.post("/api/nfa/token-uri")
-def token_uri():
-    body = request.get_json(force=True)
-    token_id = body.get("tokenId", "").strip()
-    if not token_id:
-        return err("tokenId 不能为空")
-    ok_, data = exec_cmc("TokenURI", {"tokenId": token_id})
+@validated(TokenReq)
+def token_uri(req: TokenReq):
+    ok_, res = query("TokenURI", {"tokenId": req.tokenId})
     if not ok_:
-        return err(data)
-    res = data.get("contract_result", {}).get("result", "")
-    return ok(_decode_result(res))
+        return err(res)
+    return ok(res)
 
 @app.post("/api/nfa/balance-of")
-def balance_of():
-    body = request.get_json(force=True)
-    account = body.get("account", "").strip()
-    if not account:
-        return err("account 不能为空")
-    ok_, data = exec_cmc("BalanceOf", {"account": account})
+@validated(AccountReq)
+def balance_of(req: AccountReq):
+    ok_, res = query("BalanceOf", {"account": req.account}, default="MA==")
     if not ok_:
-        return err(data)
-    res = data.get("contract_result", {}).get("result", "MA==")
-    return ok(_decode_result(res))
+        return err(res)
+    return ok(res)
+
+@app.route("/api/nfa/dashboard", methods=["GET", "POST"])
+@validated(DashboardReq)
+def dashboard(req: DashboardReq):
+    """
+    并发查询总量、余额、持有者、URI，耗时约为单次查询而非累加。
+    GET 取查询参数：/api/nfa/dashboard?account=...&tokenId=1；
+    POST 与其他查询接口一致，取 JSON 请求体（字段均可选）：{"account": "...", "tokenId": "1"}
+    """
+    queries = {"total_supply": ("TotalSupply", None, "MA==")}
+    if req.account:
+        queries["balance"] = ("BalanceOf", {"account": req.account}, "MA==")
+    if req.tokenId:
+        queries["owner"] = ("OwnerOf", {"tokenId": req.tokenId}, "")
+        queries["token_uri"] = ("TokenURI", {"tokenId": req.tokenId}, "")
+
+    results = query_many(list(queries.values()))
+    out, errors = {}, {}
+    for key, (ok_, res) in zip(queries, results):
+        if ok_:
+            out[key] = res
+        else:
+            out[key] = None
+            errors[key] = res
+    if errors:
+        out["errors"] = errors
+    return ok(out)
+
+# 批量接口支持的只读方法：(参数结构, 编译后的 schema, 结果缺省值)；TotalSupply 无参数
+_BATCH_METHODS = {
+    "TotalSupply": (None, (), "MA=="),
+    "OwnerOf": (TokenReq, _compile_schema(TokenReq), ""),
+    "TokenURI": (TokenReq, _compile_schema(TokenReq), ""),
+    "BalanceOf": (AccountReq, _compile_schema(AccountReq), "MA=="),
+}
+
+@app.post("/api/nfa/batch")
+def batch():
+    """
+    批量只读查询，一次请求完成多个调用，结果按请求顺序返回。
+    请求体示例：
+    [
+      {"method": "TotalSupply"},
+      {"method": "OwnerOf", "params": {"tokenId": "1"}}
+    ]
+    """
+    try:
+        body = _loads(request.get_data() or b"[]")
+    except ValueError:
+        return err("请求体不是合法的 JSON")
+    if not isinstance(body, list) or not body:
+        return err("请求体应为非空数组")
+    if len(body) > CM_BATCH_MAX:
+        return err(f"单次最多 {CM_BATCH_MAX} 个调用")
+
+    out = [None] * len(body)
+    calls, idx = [], []
+    for i, item in enumerate(body):
+        method = item.get("method") if isinstance(item, dict) else None
+        params = (item.get("params") or {}) if isinstance(item, dict) else {}
+        if not isinstance(method, str) or method not in _BATCH_METHODS:
+            out[i] = {"success": False, "error": f"不支持的方法：{method}"}
+            continue
+        if not isinstance(params, dict):
+            out[i] = {"success": False, "error": "params 应为 JSON 对象"}
+            continue
+        cls, schema, default = _BATCH_METHODS[method]
+        if cls is not None:
+            req, msg = _check_fields(cls, schema, params)
+            if req is None:
+                out[i] = {"success": False, "error": msg}
+                continue
+            # 只保留 schema 中的键，避免无关参数上链并污染缓存键
+            params = {key: getattr(req, name) for name, key, *_ in schema}
+        else:
+            params = None
+        calls.append((method, params, default))
+        idx.append(i)
+
+    for i, (ok_, res) in zip(idx, query_many(calls)):
+        out[i] = {"success": True, "data": res} if ok_ else {"success": False, "error": res}
+    return ok(out)
 
 # =========================
 # 业务操作：Mint / TransferFrom / Burn / 类别
 # =========================
 @app.post("/api/nfa/mint")
-def mint():
+@validated(MintReq)
+def mint(req: MintReq):
     """
     仅合约内置管理员地址（state 中 admin）可操作。
     注意：调用者由 sdk_config.yml 指定的用户决定。
     """
-    b = request.get_json(force=True)
-    to = b.get("to", "").strip()
-    token_id = b.get("tokenId", "").strip()
-    category = b.get("categoryName", "").strip()
-    metadata_text = (b.get("metadata_text") or "").encode("utf-8")
-    metadata_b64 = b.get("metadata_b64")
-
-    if not (to and token_id and category):
-        return err("to / tokenId / categoryName 不能为空")
-
-    if metadata_b64:
-        meta = metadata_b64
+    if req.metadata_b64:
+        meta = req.metadata_b64
     else:
-        # 允许传明文，后端代为 base64
-        meta = base64.b64encode(metadata_text).decode("utf-8") if metadata_text else ""
+        # 允许传明文，后端代为 base64（仅在未提供 metadata_b64 时才编码明文）
+        text = req.metadata_text
+        meta = base64.b64encode(text.encode("utf-8")).decode("ascii") if text else ""
 
-    ok_, data = exec_cmc("Mint", {"to": to, "tokenId": token_id, "categoryName": category, "metadata": meta})
+    token_id = req.tokenId
+    ok_, data = invoke("Mint", {"to": req.to, "tokenId": token_id, "categoryName": req.categoryName, "metadata": meta})
+    _query_cache.invalidate(("TotalSupply", None), ("OwnerOf", {"tokenId": token_id}),
+                            ("TokenURI", {"tokenId": token_id}), ("BalanceOf", {"account": req.to}))
     if not ok_:
         return err(data)
 
@@ -196,15 +813,12 @@ def mint():
     return ok(pretty)
 
 @app.post("/api/nfa/transfer-from")
-def transfer_from():
-    b = request.get_json(force=True)
-    from_addr = b.get("from", "").strip()
-    to_addr = b.get("to", "").strip()
-    token_id = b.get("tokenId", "").strip()
-    if not (from_addr and to_addr and token_id):
-        return err("from / to / tokenId 不能为空")
-
-    ok_, data = exec_cmc("TransferFrom", {"from": from_addr, "to": to_addr, "tokenId": token_id})
+@validated(TransferReq)
+def transfer_from(req: TransferReq):
+    from_addr, to_addr, token_id = req.from_, req.to, req.tokenId
+    ok_, data = invoke("TransferFrom", {"from": from_addr, "to": to_addr, "tokenId": token_id})
+    _query_cache.invalidate(("OwnerOf", {"tokenId": token_id}),
+                            ("BalanceOf", {"account": from_addr}), ("BalanceOf", {"account": to_addr}))
     if not ok_:
         return err(data)
     cr = data.get("contract_result", {})
@@ -217,12 +831,13 @@ def transfer_from():
     return ok(pretty)
 
 @app.post("/api/nfa/burn")
-def burn():
-    b = request.get_json(force=True)
-    token_id = b.get("tokenId", "").strip()
-    if not token_id:
-        return err("tokenId 不能为空")
-    ok_, data = exec_cmc("Burn", {"tokenId": token_id})
+@validated(TokenReq)
+def burn(req: TokenReq):
+    token_id = req.tokenId
+    ok_, data = invoke("Burn", {"tokenId": token_id})
+    # 持有者未知，失效全部余额缓存
+    _query_cache.invalidate(("TotalSupply", None), ("OwnerOf", {"tokenId": token_id}),
+                            ("TokenURI", {"tokenId": token_id}), ("BalanceOf", None))
     if not ok_:
         return err(data)
     cr = data.get("contract_result", {})
@@ -235,7 +850,8 @@ def burn():
     return ok(pretty)
 
 @app.post("/api/nfa/create-or-set-category")
-def create_or_set_category():
+@validated(CategoryReq)
+def create_or_set_category(req: CategoryReq):
     """
     给分类设置 URI（或新建分类）。
     请求体示例：
@@ -244,14 +860,10 @@ def create_or_set_category():
       "categoryURI": "https://example.org/nfa"
     }
     """
-    b = request.get_json(force=True)
-    name = b.get("categoryName", "").strip()
-    uri = b.get("categoryURI", "").strip()
-    if not (name and uri):
-        return err("categoryName / categoryURI 不能为空")
-
-    category_json = json.dumps({"categoryName": name, "categoryURI": uri})
-    ok_, data = exec_cmc("CreateOrSetCategory", {"category": category_json})
+    category_json = _dumps({"categoryName": req.categoryName, "categoryURI": req.categoryURI})
+    ok_, data = invoke("CreateOrSetCategory", {"category": category_json})
+    # TokenURI 由分类 URI 拼接而成，失效全部
+    _query_cache.invalidate(("TokenURI", None))
     if not ok_:
         return err(data)
     cr = data.get("contract_result", {})
@@ -269,4 +881,6 @@ if __name__ == "__main__":
     print(f"🚀 CMNFA backend | contract={CONTRACT_NAME}")
     print(f"📁 workdir: {WORK_DIR}")
     print(f"🔧 sdk:     {SDK_CONF_PATH}")
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    print(f"🔌 mode:    {_mode()}")
+    # 调试模式（重载器 + 调试器）仅在显式设置 FLASK_DEBUG=1 时开启；生产环境请用 gunicorn 启动
+    app.run(host="0.0.0.0", port=5000, debug=os.getenv("FLASK_DEBUG") == "1")
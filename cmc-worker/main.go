@@ -0,0 +1,103 @@
+/*
+cmc-worker：常驻的合约调用进程，供 backend.py 在 CM_MODE=worker 时使用。
+
+启动时加载一次 sdk_config.yml 并建立连接，之后从 stdin 逐行读取 JSON 请求，
+每个请求向 stdout 写回一行 JSON 响应：
+
+	请求：{"id":1,"method":"OwnerOf","params":{"tokenId":"1"},"sync":true}
+	响应：{"id":1,"ok":true,"data":{...TxResponse...}}
+	      {"id":1,"ok":false,"error":"..."}
+
+data 与 `cmc client contract user invoke` 输出的 JSON 结构一致。
+
+构建（在 chainmaker-go/tools/cmc 目录下）：
+
+	go build -o cmc-worker ./cmc-worker
+*/
+
+package main
+
+import (
+	"bufio"
+	"encoding/json"
+	"flag"
+	"fmt"
+	"os"
+
+	"chainmaker.org/chainmaker/pb-go/v2/common"
+	sdk "chainmaker.org/chainmaker/sdk-go/v2"
+)
+
+type request struct {
+	ID     uint64            `json:"id"`
+	Method string            `json:"method"`
+	Params map[string]string `json:"params"`
+	Sync   bool              `json:"sync"`
+}
+
+type response struct {
+	ID    uint64             `json:"id"`
+	OK    bool               `json:"ok"`
+	Data  *common.TxResponse `json:"data,omitempty"`
+	Error string             `json:"error,omitempty"`
+}
+
+func main() {
+	contractName := flag.String("contract-name", "CMNFA", "合约名称")
+	confPath := flag.String("sdk-conf-path", "./testdata/sdk_config.yml", "SDK 配置文件路径")
+	timeout := flag.Int64("timeout", 60, "交易超时时间（秒）")
+	flag.Parse()
+
+	client, err := sdk.NewChainClient(sdk.WithConfPath(*confPath))
+	if err != nil {
+		fmt.Fprintf(os.Stderr, "创建 SDK 客户端失败：%v\n", err)
+		os.Exit(1)
+	}
+	defer client.Stop()
+
+	in := bufio.NewScanner(os.Stdin)
+	// metadata 可能较大，放宽单行上限
+	in.Buffer(make([]byte, 0, 1<<20), 64<<20)
+	out := bufio.NewWriter(os.Stdout)
+	enc := json.NewEncoder(out)
+
+	for in.Scan() {
+		resp := handle(client, *contractName, *timeout, in.Bytes())
+		if err := enc.Encode(resp); err != nil {
+			fmt.Fprintf(os.Stderr, "写出响应失败：%v\n", err)
+			os.Exit(1)
+		}
+		if err := out.Flush(); err != nil {
+			os.Exit(1)
+		}
+	}
+	if err := in.Err(); err != nil {
+		fmt.Fprintf(os.Stderr, "读取请求失败：%v\n", err)
+		os.Exit(1)
+	}
+}
+
+func handle(client *sdk.ChainClient, contractName string, timeout int64, line []byte) *response {
+	var req request
+	if err := json.Unmarshal(line, &req); err != nil {
+		return &response{Error: "请求格式错误：" + err.Error()}
+	}
+
+	kvs := make([]*common.KeyValuePair, 0, len(req.Params))
+	for k, v := range req.Params {
+		kvs = append(kvs, &common.KeyValuePair{Key: k, Value: []byte(v)})
+	}
+
+	tx, err := client.InvokeContract(contractName, req.Method, "", kvs, timeout, req.Sync)
+	if err != nil {
+		return &response{ID: req.ID, Error: "执行异常：" + err.Error()}
+	}
+	if tx.Code != common.TxStatusCode_SUCCESS {
+		msg := tx.Message
+		if msg == "" {
+			msg = fmt.Sprintf("交易失败，状态码 %d", tx.Code)
+		}
+		return &response{ID: req.ID, Error: msg}
+	}
+	return &response{ID: req.ID, OK: true, Data: tx}
+}
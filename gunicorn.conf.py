@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+gunicorn 配置：gevent worker 下每个进程可同时处理大量等待链上结果的请求。
+用法：gunicorn -c gunicorn.conf.py backend:app
+"""
+import os
+
+# preload_app 下应用先在 master 中导入，早于 gevent worker 自己打补丁；
+# 让 backend.py 在导入时即打补丁（并在 SDK 模式下初始化 grpc 的 gevent 支持）
+os.environ.setdefault("CM_GEVENT", "1")
+
+bind = os.getenv("CM_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("CM_GUNICORN_WORKERS", "4"))
+# 查询缓存是进程内的，写操作只能失效处理它的 worker；多 worker 时默认关闭缓存，
+# 显式设置 CM_QUERY_TTL 即表示接受其他 worker 在 TTL 内返回写入前的结果
+if workers > 1:
+    os.environ.setdefault("CM_QUERY_TTL", "0")
+worker_class = "gevent"
+worker_connections = int(os.getenv("CM_WORKER_CONNECTIONS", "1000"))
+# 同步上链可能较慢，超时需大于 cmc 调用超时（60s）
+timeout = 120
+# 在 master 中预先导入应用：配置、路由、编译好的请求结构等只初始化一次，fork 后写时复制共享；
+# SDK 客户端与 cmc-worker 子进程由每个 worker 在首次调用时各自创建
+preload_app = True
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+gevent 下并发请求 dashboard / batch 的回归检查。
+
+gevent 补丁是进程级的，因此在子进程中以 CM_GEVENT=1 导入 backend.py，
+用 gevent.pywsgi 起服务，并发发出请求后汇报各请求的状态码与总耗时。
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+pytest.importorskip("gevent")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = r"""
+import base64, json, sys, time
+
+import backend
+import gevent
+from gevent.pywsgi import WSGIServer
+from urllib.request import Request, urlopen
+
+DELAY = 0.3
+
+def fake_invoke(method, params=None, sync=True):
+    time.sleep(DELAY)  # 已被 gevent 打补丁，模拟等待链上结果
+    res = base64.b64encode(f"{method}:{sorted((params or {}).items())}".encode()).decode()
+    return True, {"contract_result": {"result": res}}
+
+backend.invoke = fake_invoke
+
+server = WSGIServer(("127.0.0.1", 0), backend.app, log=None)
+server.start()
+base = f"http://127.0.0.1:{server.server_port}"
+
+def post(path, body):
+    req = Request(base + path, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"})
+    try:
+        with urlopen(req, timeout=10) as r:
+            return r.status, json.loads(r.read())["success"]
+    except Exception as e:
+        return getattr(e, "code", repr(e)), False
+
+jobs = []
+for i in range(4):
+    jobs.append(gevent.spawn(post, "/api/nfa/batch",
+                             [{"method": "OwnerOf", "params": {"tokenId": f"{i}-{j}"}} for j in range(4)]))
+    jobs.append(gevent.spawn(post, "/api/nfa/dashboard", {"account": f"a{i}", "tokenId": f"t{i}"}))
+start = time.monotonic()
+gevent.joinall(jobs)
+print(json.dumps({"results": [j.value for j in jobs], "elapsed": time.monotonic() - start, "delay": DELAY}))
+"""
+
+
+def test_concurrent_fanout_endpoints_under_gevent(tmp_path):
+    env = dict(os.environ, CM_GEVENT="1", CM_MODE="cli", CM_QUERY_TTL="0", CM_WORKDIR=str(tmp_path))
+    p = subprocess.run([sys.executable, "-c", SCRIPT], cwd=ROOT, env=env,
+                       capture_output=True, text=True, timeout=60)
+    assert p.returncode == 0, p.stderr
+    out = json.loads(p.stdout.strip().splitlines()[-1])
+
+    assert out["results"] == [[200, True]] * 8
+    # 8 个请求共 32 次调用，串行约需 9.6s；并发时应接近单次调用耗时
+    assert out["elapsed"] < out["delay"] * 4